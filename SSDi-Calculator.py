@@ -1,11 +1,16 @@
 import argparse
 import logging
+import math
 import os
-import random
 import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from numba import njit, prange, get_num_threads, set_num_threads
 from scipy import stats
 from datetime import datetime
 
+log = logging.getLogger(__name__)
+
 def get_args():
     """
     Get arguments from command line.
@@ -76,176 +81,215 @@ def setup_logging():
 def input_to_dict(input, fileformat):
     """
     Build a dictionary data structure from input file,
-    where each key is a species and the value is a sub-dictionary 
-    of sex-specific sizes. The sub-dictionary contains keys "M" and "F", 
-    with values of lists containing floats of size data. Returns the 
-    dictionary, labeled as species_dict.
+    where each key is a species and the value is a sub-dictionary
+    of sex-specific sizes. The sub-dictionary contains keys "M" and "F",
+    with values of float64 ndarrays of size data. Returns the
+    dictionary, labeled as species_dict, along with the sorted list
+    of species names (sorted once here so downstream consumers do
+    not each re-sort the keys).
 
     Args:
     input - Full path to the input data file.
-    fileformat - Specifies tab-delimited or csv format for input file. 
-    """    
+    fileformat - Specifies tab-delimited or csv format for input file.
+    """
     print("\n\n\n")
-    logging.info("Reading input data file: {}".format(input.split('/')[-1]))
-    
+    log.info("Reading input data file: %s", input.split('/')[-1])
+
+    # read the first three columns with the pandas c-engine parser,
+    # which tokenizes and float-converts far faster than line splitting
+    sep = '\t' if fileformat == 'tab' else ','
+    df = pd.read_csv(input, sep=sep, header=0, usecols=range(3),
+                         names=['species', 'sex', 'size'],
+                         dtype={'species': str, 'sex': str, 'size': np.float64})
+
+    # drop lines missing any of the three expected columns
+    bad = df.isna().any(axis=1)
+    if bad.any():
+        log.debug("input_to_dict: Skipped %s incomplete lines.", int(bad.sum()))
+        df = df[~bad]
+
+    # uppercase sex labels once, then drop entries that are not M or F
+    df['sex'] = df['sex'].str.upper()
+    skipped = ~df['sex'].isin(('M', 'F'))
+    if skipped.any():
+        log.debug("input_to_dict: Skipped %s entries without M/F sex label.", int(skipped.sum()))
+        df = df[~skipped]
+
     # initiate empty dictionary
     species_dict = {}
 
-    # open transcript file
-    with open(input, 'r') as fh:
-        # skip header
-        next(fh)
-        # iterate over lines in file
-        for line in fh:
-            # if line is not blank
-            if line.strip():
-                # split line by tab or column, depending on format specified
-                if fileformat == 'tab':
-                    cols = line.strip().split('\t')
-                elif fileformat == 'csv':
-                    cols = line.strip().split(',')
-
-                # quick check that expected number of columns is present
-                if len(cols) < 3:
-                    logging.debug("input_to_dict: Bad line - {}".format(line))
-                # if 3 or more cols:
-                else:
-                    # label split elements for simplicity
-                    species, sex, size = cols[0], cols[1].upper(), float(cols[2])
-
-                    # check if key is in dictionary
-                    if species not in species_dict:
-                        # if not, add species key to dict, with new sex-specific dict
-                        # with keys = M, F, and vals as empty lists
-                        species_dict[species] = {"M":[], "F":[]}
-                        # add data
-                        if sex == "M":
-                            species_dict[species]["M"].append(size)
-                        elif sex == "F":
-                            species_dict[species]["F"].append(size)
-                        else:
-                            logging.debug("input_to_dict: Skipping entry - {}".format(species, sex, size))
-                    else:
-                        # if key already in dictionary, add data
-                        if sex == "M":
-                            species_dict[species]["M"].append(size)
-                        elif sex == "F":
-                            species_dict[species]["F"].append(size)
-                        else:
-                            logging.debug("input_to_dict: Skipping entry - {}, {}, {}".format(species, sex, size))
-                            
-    logging.info("Found data for {} species.\n\n".format(len(species_dict)))
-    
-    # send back data dictionary
-    return species_dict
+    # group sizes by species and sex, storing each group as a
+    # contiguous float64 array; setdefault inserts the sex-specific
+    # sub-dict with empty arrays on first sight of a species, with a
+    # single hash lookup per group
+    for (species, sex), grp in df.groupby(['species', 'sex'], sort=False):
+        species_dict.setdefault(species, {"M": np.array([], dtype=np.float64),
+                                              "F": np.array([], dtype=np.float64)})[sex] = grp['size'].to_numpy()
+
+    log.info("Found data for %s species.\n\n", len(species_dict))
 
-def quick_counts(species_dict):
+    # send back data dictionary and sorted species names
+    return species_dict, sorted(species_dict)
+
+def quick_counts(species_dict, sorted_species):
     """
     Log information about sample sizes for each species.
 
     Args:
     species_dict - Dictionary data structure from input_to_dict().
+    sorted_species - Sorted list of species names from input_to_dict().
     """
 
     # initiate three different zero counts
     onecount, twocount, threecount = int(0), int(0), int(0)
 
-    # iterate over dictionary keys
-    for k, v in sorted(species_dict.items()):
+    # iterate over species in sorted order
+    for k in sorted_species:
+        v = species_dict[k]
         #print("{}:\n\tM:{}\n\tF:{}\n".format(k, v["M"], v["F"]))
         # add to relevant counters
-        if len(v["M"]) > 1 and len(v["F"]) > 1:
+        if v["M"].size > 1 and v["F"].size > 1:
             onecount += 1
-        if len(v["M"]) > 2 and len(v["F"]) > 2:
+        if v["M"].size > 2 and v["F"].size > 2:
             twocount += 1
-        if len(v["M"]) > 3 and len(v["F"]) > 3:
+        if v["M"].size > 3 and v["F"].size > 3:
             threecount += 1
             
     # log information
-    logging.debug("Species with > 1 M and > 1 F: {}".format(onecount))
-    logging.debug("Species with > 2 M and > 2 F: {}".format(twocount))
-    logging.debug("Species with > 3 M and > 3 F: {}\n\n".format(threecount))
+    log.debug("Species with > 1 M and > 1 F: %s", onecount)
+    log.debug("Species with > 2 M and > 2 F: %s", twocount)
+    log.debug("Species with > 3 M and > 3 F: %s\n\n", threecount)
     
 
-def run_ssdi_calculations(species_dict):
+def _process_species(k, v, seed):
+    """
+    Runs all tests for a single species. Executed in parallel worker
+    processes, so instead of logging directly it collects messages as
+    (level, text, args) tuples for the main process to emit in order;
+    formatting is deferred until a record is actually emitted.
+    Returns (species, record, messages), where record is the results
+    sub-dictionary for calc_dict, or None if the species lacks data
+    for one of the sexes.
+
+    Args:
+    k - Species name.
+    v - Sub-dictionary of sex-specific size arrays for the species.
+    seed - Integer seed for the permutation test.
+    """
+    # species are already spread across worker processes, so run the
+    # permutation kernel single-threaded here; otherwise each of the
+    # N workers would spin up N numba threads and oversubscribe cores
+    set_num_threads(1)
+
+    messages = []
+
+    # compute counts and sex-specific means once per species,
+    # rather than repeating the reductions in every branch below
+    nF, nM = v["F"].size, v["M"].size
+    meanF = round(v["F"].mean(), 1) if nF else None
+    meanM = round(v["M"].mean(), 1) if nM else None
+
+    # log species and counts per sex
+    messages.append((logging.INFO, "Species: %s", (k,)))
+    messages.append((logging.INFO, "Males: %s", (nM,)))
+    messages.append((logging.INFO, "Females: %s", (nF,)))
+
+    # series of rules to handle edge cases properly
+    if nF == 1 and nM == 1:
+        # run standard ssdi calculation using each point estimate
+        ssdi = ssdi_single(v["F"][0], v["M"][0])
+        messages.append((logging.INFO, "Standard SSDi: %s\n", (ssdi,)))
+        # no pairwise comparisons are possible, skip remaining tests
+        avg_ssdi, p_pair, low, high, p_perm, diff, avgf, avgm = "NA", "NA", "NA", "NA", "NA", "NA", "NA", "NA"
+
+    elif nF > 1 and nM == 1:
+        # run standard ssdi calculation using average from females and point estimate for males
+        ssdi = ssdi_single(meanF, v["M"][0])
+        messages.append((logging.INFO, "Standard SSDi: %s.", (ssdi,)))
+        # perform pairwise calculations and corresponding t-test
+        avg_ssdi, p_pair = ssdi_pairwise(v["F"], v["M"], ttest=True)
+        messages.append((logging.INFO, "Pairwise Analyses: Average pairwise SSDi: %s.", (avg_ssdi,)))
+        messages.append((logging.DEBUG, "Pairwise Analyses: One-sample t-test P-value: %s.", (p_pair,)))
+        # perform permutation test
+        low, high, p_perm = run_permutations(v["F"], v["M"], avg_ssdi, seed, messages)
+        diff = abs(ssdi - avg_ssdi)
+        avgf, avgm = meanF, "NA"
+
+    elif nF == 1 and nM > 1:
+        # run standard ssdi calculation using point estimate for females and average from males
+        ssdi = ssdi_single(v["F"][0], meanM)
+        messages.append((logging.INFO, "Standard SSDi: %s.", (ssdi,)))
+        # perform pairwise calculations and corresponding t-test
+        avg_ssdi, p_pair = ssdi_pairwise(v["F"], v["M"], ttest=True)
+        messages.append((logging.INFO, "Pairwise Analyses: Average pairwise SSDi: %s.", (avg_ssdi,)))
+        messages.append((logging.DEBUG, "Pairwise Analyses: One-sample t-test P-value: %s.", (p_pair,)))
+        # perform permutation test
+        low, high, p_perm = run_permutations(v["F"], v["M"], avg_ssdi, seed, messages)
+        diff = abs(ssdi - avg_ssdi)
+        avgf, avgm = "NA", meanM
+
+    elif nF > 1 and nM > 1:
+        # run standard ssdi calculation using averages per sex
+        ssdi = ssdi_single(meanF, meanM)
+        messages.append((logging.INFO, "Standard SSDi: %s.", (ssdi,)))
+        # perform pairwise calculations and corresponding t-test
+        avg_ssdi, p_pair = ssdi_pairwise(v["F"], v["M"], ttest=True)
+        messages.append((logging.INFO, "Pairwise Analyses: Average pairwise SSDi: %s.", (avg_ssdi,)))
+        messages.append((logging.DEBUG, "Pairwise Analyses: One-sample t-test P-value: %s.", (p_pair,)))
+        # perform permutation test
+        low, high, p_perm = run_permutations(v["F"], v["M"], avg_ssdi, seed, messages)
+        diff = abs(ssdi - avg_ssdi)
+        avgf, avgm = meanF, meanM
+
+    else:
+        # these are species missing data for one of the sexes
+        # we will skip them and not include them in the output file
+        ssdi = None
+        messages.append((logging.ERROR, "Species %s does not have at least 1 M and 1 F, skipping calculations.\n", (k,)))
+
+    # species with data will have ssdi val, use to eliminate bad species
+    if ssdi:
+        # build results sub-dictionary
+        record = {"males":nM, "females":nF,
+                      "ssdi":ssdi, "avg_ssdi":avg_ssdi, "p_pair":p_pair,
+                      "low":low, "high":high, "p_perm":p_perm, "diff":diff,
+                      "avgf":avgf, "avgm":avgm}
+    else:
+        record = None
+
+    return k, record, messages
+
+
+def run_ssdi_calculations(species_dict, sorted_species):
     """
-    Runs all tests using data stored in species_dict 
-    data structure.
+    Runs all tests using data stored in species_dict
+    data structure. Species are independent, so they are dispatched
+    to all available cores with joblib; per-species seeds are drawn
+    up front so permutation results do not depend on scheduling.
 
     Args:
     species_dict - Dictionary data structure from input_to_dict().
+    sorted_species - Sorted list of species names from input_to_dict().
     """
 
+    # draw one seed per species
+    seeds = np.random.default_rng().integers(2**63, size=len(sorted_species))
+
+    # process all species in parallel across cores, in sorted order
+    results = Parallel(n_jobs=-1)(
+        delayed(_process_species)(k, species_dict[k], int(s))
+        for k, s in zip(sorted_species, seeds))
+
     # initiate empty dictionary to store all results
     calc_dict = {}
-    
-    # iterate over dictionary keys
-    for k, v in sorted(species_dict.items()):
-        # log species and counts per sex
-        logging.info("Species: {}".format(k))
-        logging.info("Males: {}".format(len(v["M"])))
-        logging.info("Females: {}".format(len(v["F"])))
-
-        # series of rules to handle edge cases properly
-        if len(v["F"]) == 1 and len(v["M"]) == 1:
-            # run standard ssdi calculation using each point estimate
-            ssdi = ssdi_single(v["F"][0], v["M"][0])
-            logging.info("Standard SSDi: {}\n".format(ssdi))
-            # no pairwise comparisons are possible, skip remaining tests
-            avg_ssdi, p_pair, low, high, p_perm, diff, avgf, avgm = "NA", "NA", "NA", "NA", "NA", "NA", "NA", "NA"
-            
-        elif len(v["F"]) > 1 and len(v["M"]) == 1:
-            # run standard ssdi calculation using average from females and point estimate for males
-            ssdi = ssdi_single(round(np.mean(v["F"]), 1), v["M"][0])
-            logging.info("Standard SSDi: {}.".format(ssdi))
-            # perform pairwise calculations and corresponding t-test
-            avg_ssdi, p_pair = ssdi_pairwise(v["F"], v["M"], ttest=True)
-            logging.info("Pairwise Analyses: Average pairwise SSDi: {}.".format(avg_ssdi))
-            logging.debug("Pairwise Analyses: One-sample t-test P-value: {}.".format(p_pair))
-            # perform permutation test
-            low, high, p_perm = run_permutations(v["F"], v["M"], avg_ssdi)
-            diff = abs(ssdi - avg_ssdi)
-            avgf, avgm = round(np.mean(v["F"]), 1), "NA"
-
-        elif len(v["F"]) == 1 and len(v["M"]) > 1:
-            # run standard ssdi calculation using point estimate for females and average from males
-            ssdi = ssdi_single(v["F"][0], round(np.mean(v["M"]), 1))
-            logging.info("Standard SSDi: {}.".format(ssdi))
-            # perform pairwise calculations and corresponding t-test
-            avg_ssdi, p_pair = ssdi_pairwise(v["F"], v["M"], ttest=True)
-            logging.info("Pairwise Analyses: Average pairwise SSDi: {}.".format(avg_ssdi))
-            logging.debug("Pairwise Analyses: One-sample t-test P-value: {}.".format(p_pair))
-            # perform permutation test
-            low, high, p_perm = run_permutations(v["F"], v["M"], avg_ssdi)
-            diff = abs(ssdi - avg_ssdi)
-            avgf, avgm = "NA", round(np.mean(v["M"]), 1)
-
-        elif len(v["F"]) > 1 and len(v["M"]) > 1:
-            # run standard ssdi calculation using averages per sex
-            ssdi = ssdi_single(round(np.mean(v["F"]), 1), round(np.mean(v["M"]), 1))
-            logging.info("Standard SSDi: {}.".format(ssdi))
-            # perform pairwise calculations and corresponding t-test
-            avg_ssdi, p_pair = ssdi_pairwise(v["F"], v["M"], ttest=True)
-            logging.info("Pairwise Analyses: Average pairwise SSDi: {}.".format(avg_ssdi))
-            logging.debug("Pairwise Analyses: One-sample t-test P-value: {}.".format(p_pair))
-            # perform permutation test
-            low, high, p_perm = run_permutations(v["F"], v["M"], avg_ssdi)
-            diff = abs(ssdi - avg_ssdi)
-            avgf, avgm = round(np.mean(v["F"]), 1), round(np.mean(v["M"]), 1)
 
-        else:
-            # these are species missing data for one of the sexes
-            # we will skip them and not include them in the output file
-            ssdi = None
-            logging.error("Species {} does not have at least 1 M and 1 F, skipping calculations.\n".format(k))
-
-        # species with data will have ssdi val, use to eliminate bad species
-        if ssdi:
-            # add all relevant vals to new dictionary structure
-            calc_dict[k] = {"males":len(v["M"]), "females":len(v["F"]),
-                                "ssdi":ssdi, "avg_ssdi":avg_ssdi, "p_pair":p_pair,
-                                "low":low, "high":high, "p_perm":p_perm, "diff":diff,
-                                "avgf":avgf, "avgm":avgm}
+    # emit the deferred log messages in species order and collect records
+    for k, record, messages in results:
+        for level, text, args in messages:
+            log.log(level, text, *args)
+        if record is not None:
+            calc_dict[k] = record
+
     return calc_dict
 
     
@@ -260,16 +304,52 @@ def ssdi_single(f, m):
     f - Single value of female size (float)
     m - Single value of male size (float)
     """
-    if m > f:
-        ssdi = round((-1*((m / f) - 1)), 3)
-    elif f > m:
-        ssdi = round(((f / m) - 1), 3)
-    elif f == m:
-        ssdi = float(0)
-        
+    # branchless form: magnitude from the larger/smaller ratio, sign
+    # taken from f - m (positive if females larger, negative if males
+    # larger, zero if equal)
+    ssdi = round(math.copysign((max(f, m) / min(f, m)) - 1.0, f - m), 3)
+
     return ssdi
     
 
+@njit(cache=True, fastmath=True)
+def _pairwise_mean(F, M):
+    """
+    Compiled kernel returning the mean pairwise SSDi for float64
+    arrays of female and male sizes. Accumulates the sum in a scalar
+    so no intermediate array is allocated; this is the hot path for
+    the permutation test.
+    """
+    s = 0.0
+    for i in range(F.size):
+        fi = F[i]
+        for j in range(M.size):
+            m = M[j]
+            # branchless: min/max compile to single fp instructions
+            # and copysign avoids the per-pair comparisons; each pair
+            # is rounded to 3 decimals to match _pairwise_fill, so the
+            # null distribution and the empirical mean share the same
+            # rounding pipeline
+            s += math.copysign(round((max(fi, m) / min(fi, m)) - 1.0, 3), fi - m)
+    return s / (F.size * M.size)
+
+
+@njit(cache=True, fastmath=True)
+def _pairwise_fill(F, M, out):
+    """
+    Compiled kernel filling a preallocated flat array with every
+    pairwise SSDi value, for use when the full distribution is
+    needed (e.g. the 1-sample t-test).
+    """
+    k = 0
+    for i in range(F.size):
+        fi = F[i]
+        for j in range(M.size):
+            m = M[j]
+            out[k] = math.copysign(round((max(fi, m) / min(fi, m)) - 1.0, 3), fi - m)
+            k += 1
+
+
 def ssdi_pairwise(females, males, ttest=False):
     """
     Performs all pairwise SSDi calculations using lists of floats 
@@ -285,100 +365,140 @@ def ssdi_pairwise(females, males, ttest=False):
     ttest - If True, runs 1-sample t-test; Default = False.
     """
 
-    # intiate empty list to store pairwise ssdi vals
-    vals = []
-    # iterate over females
-    for f in females:
-        # iterate over males
-        for m in males:
-            # for each combination, calculate ssdi
-            vals.append(ssdi_single(f, m))
+    # convert inputs to float arrays once (no-op if already arrays)
+    F = np.asarray(females, dtype=np.float64)
+    M = np.asarray(males, dtype=np.float64)
 
-    # get mean pairwise ssdi val
-    avg_ssdi = round(np.mean(vals), 3)
-
-    # if no t-test, assign NA to p-val
+    # if no t-test, assign NA to p-val; only the mean is needed,
+    # so use the allocation-free compiled kernel (permutation hot path)
     if ttest is False:
+        avg_ssdi = round(_pairwise_mean(F, M), 3)
         p = "NA"
 
     else:
-        # perform 1 sample t-test against hypothesized mean of 0
-        results = stats.ttest_1samp(vals, 0)
+        # fill a flat array with all pairwise vals using the
+        # compiled kernel (already rounded per pair), then get the mean
+        vals = np.empty(F.size * M.size, dtype=np.float64)
+        _pairwise_fill(F, M, vals)
+        avg_ssdi = round(vals.mean(), 3)
+
+        # perform 1 sample t-test against hypothesized mean of 0,
+        # computed directly from the summary statistics to skip the
+        # per-call overhead of stats.ttest_1samp
+        n = vals.size
+        tstat = vals.mean() * math.sqrt(n) / vals.std(ddof=1)
+        pval = 2.0 * stats.t.sf(abs(tstat), n - 1)
 
         # get p-val in readable format
-        if results[1] <= 0.001:
+        if pval <= 0.001:
             p = "<0.001"
         else:
-            p = round(results[1], 3)
+            p = round(pval, 3)
 
     return avg_ssdi, p
 
-def run_permutations(females, males, emp_ssdi):
+@njit(parallel=True, cache=True)
+def _run_perms(all_sizes, n_f, n_iter, seed, scratch):
+    """
+    Compiled kernel performing the full permutation test. The caller
+    provides scratch with one reusable shuffle buffer per worker
+    thread (allocating it outside keeps the kernel free of dynamic
+    globals, so it stays disk-cacheable); replicates are striped
+    across the buffer rows and run in parallel via prange. Each
+    replicate refills its row with the combined size array, shuffles
+    it in place with a Fisher-Yates pass driven by a per-replicate
+    xorshift64 state (derived from seed), and stores the mean pairwise
+    SSDi of the reshuffled sexes. Returns the array of permuted SSDi
+    means.
     """
-    Performs permutation test with 10,000 bootstraps to 
-    generate a null distribution where male size = female size. 
-    Shuffles male and female labels and performs all pairwise 
+    out = np.empty(n_iter, dtype=np.float64)
+    n_buf = scratch.shape[0]
+    for b in prange(n_buf):
+        local = scratch[b]
+        for t in range(b, n_iter, n_buf):
+            local[:] = all_sizes
+            # derive an independent non-zero rng state for this replicate
+            state = np.uint64(seed) ^ (np.uint64(t + 1) * np.uint64(0x9E3779B97F4A7C15))
+            if state == np.uint64(0):
+                state = np.uint64(0x9E3779B97F4A7C15)
+            # Fisher-Yates shuffle using xorshift64
+            for i in range(local.size - 1, 0, -1):
+                state ^= state << np.uint64(13)
+                state ^= state >> np.uint64(7)
+                state ^= state << np.uint64(17)
+                j = int(state % np.uint64(i + 1))
+                tmp = local[i]
+                local[i] = local[j]
+                local[j] = tmp
+            out[t] = _pairwise_mean(local[:n_f], local[n_f:])
+    return out
+
+
+# prefer the AOT-compiled kernels when the prebuilt ssdi_kernels
+# module is available (no JIT warmup on first use); it is produced by
+# build-kernels.py, and the @njit versions above are used otherwise
+try:
+    from ssdi_kernels import pairwise_mean as _pairwise_mean, run_perms as _run_perms
+except ImportError:
+    pass
+
+
+def run_permutations(females, males, emp_ssdi, seed, messages):
+    """
+    Performs permutation test with 10,000 bootstraps to
+    generate a null distribution where male size = female size.
+    Shuffles male and female labels and performs all pairwise
     comparisons, then calculates mean SSDi for the replicate.
-    Based on resulting distribution from bootstrapping, calculates 
-    a two-tailed p-val based on position of empirical SSDi. 
-    Returns critical values from bootstrapping distribution and 
+    Based on resulting distribution from bootstrapping, calculates
+    a two-tailed p-val based on position of empirical SSDi.
+    Returns critical values from bootstrapping distribution and
     the p-val.
 
     Args:
     females - List of float values for female body sizes.
     males - List of float values for female body sizes.
     emp_ssdi - Empirical SSDi value.
+    seed - Integer seed for the permutation kernel.
+    messages - List collecting (level, text, args) log tuples for the caller.
     """
 
-    # create initial combined list of males + females
-    allsizes = females + males
-    #print "combined", allsizes
-    # initiate empty list to store permuted ssdi means
-    permuted_ssdi_vals = []
-    # perform 10,000 bootstraps
-    for i in range(0, 10000):
-        # randomly shuffle combined list
-        randomized = random.sample(allsizes, len(allsizes))
-        #print "random", randomized
-        # create new lists of females and males that are the same
-        # length as the originals
-        newf, newm = randomized[:len(females)], randomized[len(females):]
-        #print "newf", newf
-        #print "newm", newm
-        # get mean ssdi
-        perm_avg_ssdi, p = ssdi_pairwise(newf, newm)
-        permuted_ssdi_vals.append(perm_avg_ssdi)
-
-    # perform significance testing
-    permuted_ssdi_vals.sort()
-    
-    # get percentiles for test
-    low, high = round(np.percentile(permuted_ssdi_vals, 2.5), 3), round(np.percentile(permuted_ssdi_vals, 97.5), 3)
-    
+    # create initial combined array of females + males
+    allsizes = np.concatenate((np.asarray(females, dtype=np.float64),
+                                   np.asarray(males, dtype=np.float64)))
+    # perform 10,000 bootstraps inside the compiled parallel kernel,
+    # which shuffles and computes the mean pairwise ssdi per replicate;
+    # the per-thread shuffle buffers are allocated here (see _run_perms)
+    scratch = np.empty((get_num_threads(), allsizes.size), dtype=np.float64)
+    permuted_ssdi_vals = np.round(_run_perms(allsizes, len(females), 10000, seed, scratch), 3)
+
+    # get percentiles for test, in a single vectorized pass
+    low, high = np.percentile(permuted_ssdi_vals, [2.5, 97.5]).round(3)
+
     # calculate p-value based on position of empirical value in distribution
-    ptwotail = round((float(len([x for x in permuted_ssdi_vals if abs(x) > abs(emp_ssdi)])) + 1) / (float(len(permuted_ssdi_vals)) + 1), 5)
+    abs_emp = abs(emp_ssdi)
+    ptwotail = round((np.count_nonzero(np.abs(permuted_ssdi_vals) > abs_emp) + 1) / (permuted_ssdi_vals.size + 1), 5)
     # get p-val in readable format
     if ptwotail <= 0.001:
         p = "<0.001"
     else:
         p = round(ptwotail, 3)
 
-    # write critical vals and empirical val to log
-    logging.info("Permutation Test: 2.5 and 97.5 percentile values: {}, {}.".format(low, high))
-    logging.info("Permutation Test: Empirical value: {}".format(emp_ssdi))
+    # record critical vals and empirical val for the log
+    messages.append((logging.INFO, "Permutation Test: 2.5 and 97.5 percentile values: %s, %s.", (low, high)))
+    messages.append((logging.INFO, "Permutation Test: Empirical value: %s", (emp_ssdi,)))
 
-    # log statement about where empirical value is in distribution
+    # record statement about where empirical value is in distribution
     if emp_ssdi <= low:
-        logging.info("Permutation Test: Empirical value lies outside the 2.5 percentile.")
+        messages.append((logging.INFO, "Permutation Test: Empirical value lies outside the 2.5 percentile.", ()))
 
     elif emp_ssdi > low and emp_ssdi < high:
-        logging.info("Permutation Test: Empirical value within the 2.5 and 97.5 percentiles.")
+        messages.append((logging.INFO, "Permutation Test: Empirical value within the 2.5 and 97.5 percentiles.", ()))
 
     elif emp_ssdi >= high:
-        logging.info("Permutation Test: Empirical value lies outside the 97.5 percentile.")
+        messages.append((logging.INFO, "Permutation Test: Empirical value lies outside the 97.5 percentile.", ()))
 
-    # log p-val of permutation test
-    logging.info("Permutation Test: Permutation test P-value: {}.\n".format(p))
+    # record p-val of permutation test
+    messages.append((logging.INFO, "Permutation Test: Permutation test P-value: %s.\n", (p,)))
 
     return low, high, p
 
@@ -390,42 +510,33 @@ def write_output(calc_dict):
     Args:
     calc_dict - Dictionary data structure resulting from run_ssdi_calculations().
     """
-    logging.info("Writing output files.\n\n")
-    
-    # ensure output files do not exist, if so remove
-    if os.path.exists("SSDi-Results.txt"):
-        os.remove("SSDi-Results.txt")
-    if os.path.exists("SSDi-Results.csv"):
-        os.remove("SSDi-Results.csv")
-
-    # write all relevant data to outputs
-    with open('SSDi-Results.txt', 'a') as fh1, open('SSDi-Results.csv', 'a') as fh2:
-        
-        fh1.write('{0}\t{1}\t{2}\t{3}\t{4}\t{5}\t{6}\t{7}\t{8}\t{9}\t{10}\n'.format("Species", "Number_Males", "Number_Females",
-                                                                                        "Avg_Male", "Avg_Female", "Standard_SSDi",
-                                                                                        "Avg_Pairwise_SSDi", "AbsDifference",
-                                                                                        "Dimorphism_PValue", "2.5_percentile",
-                                                                                        "97.5_percentile"))
-        
-        fh2.write('{0},{1},{2},{3},{4},{5},{6},{7},{8},{9},{10}\n'.format("Species", "Number_Males", "Number_Females",
-                                                                              "Avg_Male", "Avg_Female","Standard_SSDi",
-                                                                              "Avg_Pairwise_SSDi", "AbsDifference",
-                                                                              "Dimorphism_PValue", "2.5_percentile",
-                                                                              "97.5_percentile"))
-        
-        for k, v in sorted(calc_dict.items()):
-            
-            fh1.write('{0}\t{1}\t{2}\t{3}\t{4}\t{5}\t{6}\t{7}\t{8}\t{9}\t{10}\n'.format(k, calc_dict[k]["males"], calc_dict[k]["females"],
-                                                                                            calc_dict[k]["avgm"], calc_dict[k]["avgf"],
-                                                                                            calc_dict[k]["ssdi"], calc_dict[k]["avg_ssdi"],
-                                                                                            calc_dict[k]["diff"], calc_dict[k]["p_perm"],
-                                                                                            calc_dict[k]["low"], calc_dict[k]["high"]))
-            
-            fh2.write('{0},{1},{2},{3},{4},{5},{6},{7},{8},{9},{10}\n'.format(k, calc_dict[k]["males"], calc_dict[k]["females"],
-                                                                                  calc_dict[k]["avgm"], calc_dict[k]["avgf"],
-                                                                                  calc_dict[k]["ssdi"], calc_dict[k]["avg_ssdi"],
-                                                                                  calc_dict[k]["diff"], calc_dict[k]["p_perm"],
-                                                                                  calc_dict[k]["low"], calc_dict[k]["high"]))
+    log.info("Writing output files.\n\n")
+
+    # build a dataframe from the results (calc_dict is already in
+    # sorted species order) and relabel columns for the output
+    # headers; the columns are passed explicitly so an empty result
+    # set (all species skipped) still writes header-only files
+    df = pd.DataFrame.from_dict(calc_dict, orient='index',
+                                    columns=["males", "females", "ssdi", "avg_ssdi",
+                                                 "p_pair", "low", "high", "p_perm",
+                                                 "diff", "avgf", "avgm"])
+    df.index.name = "Species"
+    df = df.reset_index()
+    df = df.rename(columns={"males": "Number_Males", "females": "Number_Females",
+                                "avgm": "Avg_Male", "avgf": "Avg_Female",
+                                "ssdi": "Standard_SSDi", "avg_ssdi": "Avg_Pairwise_SSDi",
+                                "diff": "AbsDifference", "p_perm": "Dimorphism_PValue",
+                                "low": "2.5_percentile", "high": "97.5_percentile"})
+
+    # reorder columns to match the output spec
+    df = df[["Species", "Number_Males", "Number_Females", "Avg_Male",
+                 "Avg_Female", "Standard_SSDi", "Avg_Pairwise_SSDi",
+                 "AbsDifference", "Dimorphism_PValue", "2.5_percentile",
+                 "97.5_percentile"]]
+
+    # write both outputs in one pass each through pandas IO
+    df.to_csv('SSDi-Results.txt', sep='\t', index=False, na_rep='NA')
+    df.to_csv('SSDi-Results.csv', sep=',', index=False, na_rep='NA')
     
     
 def main():
@@ -440,22 +551,22 @@ def main():
 
     # configure logging
     setup_logging()
-    logging.debug("BEGINNING ANALYSIS")
-    logging.debug("Arguments: \n\t\t-i {} \n\t\t-f {} \n\t\t-o {}".format(args.input, args.fileformat, args.outdir))
+    log.debug("BEGINNING ANALYSIS")
+    log.debug("Arguments: \n\t\t-i %s \n\t\t-f %s \n\t\t-o %s", args.input, args.fileformat, args.outdir)
     
     # get information from transcripts input file
-    species_dict = input_to_dict(args.input, args.fileformat)
+    species_dict, sorted_species = input_to_dict(args.input, args.fileformat)
 
     # record quick info about sample sizes
-    quick_counts(species_dict)
+    quick_counts(species_dict, sorted_species)
 
     # create data structure to store all test results
-    calc_dict = run_ssdi_calculations(species_dict)
+    calc_dict = run_ssdi_calculations(species_dict, sorted_species)
 
     # write output files
     write_output(calc_dict)
             
-    logging.info("Finished! Total elapsed time: {} (H:M:S)\n\n".format(datetime.now() - tb))
+    log.info("Finished! Total elapsed time: %s (H:M:S)\n\n", datetime.now() - tb)
 
     
 if __name__ == '__main__':